@@ -1,107 +1,551 @@
 import argparse
+import atexit
+import email.utils
+import functools
+import io
 import json
 import os
+import pickle
+import random
 import subprocess
 import sys
-from datetime import datetime, timedelta, timezone
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import ijson  # optional: streams single nodes out of large lock files
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # optional: much faster full parses of large lock files
+except ImportError:
+    orjson = None
+
+LOCK_ERRORS = (FileNotFoundError, json.JSONDecodeError) + (
+    (ijson.JSONError,) if ijson else ()
+)
 
 # --- Configuration ---
 FLAKE_LOCK_PATH = os.environ.get("NH_FLAKE", ".") + "/flake.lock"
+GRAPHQL_URL = "https://api.github.com/graphql"
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "flake2date"
+)
+ETAG_CACHE_PATH = os.path.join(CACHE_DIR, "etags.json")
+LOCK_CACHE_PATH = os.path.join(CACHE_DIR, "lock.pkl")
+# `gh auth token` output is reused across runs from the per-user runtime dir.
+TOKEN_CACHE_PATH = (
+    os.path.join(os.environ["XDG_RUNTIME_DIR"], "flake2date.token")
+    if os.environ.get("XDG_RUNTIME_DIR")
+    else None
+)
+TOKEN_CACHE_TTL = 3600  # seconds
+# Seconds before a stalled GitHub request is given up on.
+REQUEST_TIMEOUT = 10.0
+# Concurrent GitHub requests in --all mode; kept low for secondary rate limits.
+MAX_WORKERS = 8
+# Below this many remaining core requests, pause until the window resets.
+RATE_LIMIT_THRESHOLD = 50
+# Longest we are willing to sleep for a rate limit before giving up.
+RATE_LIMIT_MAX_WAIT = 60.0
+RATE_LIMIT_RETRIES = 6
+
+
+_etag_cache = None
+_etag_cache_dirty = False
+_etag_cache_lock = threading.Lock()
+
+
+def _load_etag_cache():
+    """Loads the ETag cache on first use; caller must hold _etag_cache_lock."""
+    global _etag_cache
+    if _etag_cache is None:
+        try:
+            with open(ETAG_CACHE_PATH, "r") as f:
+                _etag_cache = json.load(f)
+        except (OSError, ValueError):
+            _etag_cache = {}
+        atexit.register(save_etag_cache)
+    return _etag_cache
+
+
+def get_cached_etag(key):
+    """Returns the cached {"etag", "ts"} entry for key, if any."""
+    with _etag_cache_lock:
+        return _load_etag_cache().get(key)
+
+
+def set_cached_etag(key, entry):
+    """Remembers an ETag entry; written to disk at exit."""
+    global _etag_cache_dirty
+    with _etag_cache_lock:
+        _load_etag_cache()[key] = entry
+        _etag_cache_dirty = True
+
+
+def save_etag_cache():
+    """Atomically writes the ETag cache back if anything changed."""
+    with _etag_cache_lock:
+        if not _etag_cache_dirty:
+            return
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp_path = f"{ETAG_CACHE_PATH}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(_etag_cache, f)
+            os.replace(tmp_path, ETAG_CACHE_PATH)
+        except OSError:
+            pass
+
 
+# Shared by all worker threads so they back off together.
+_rate_limit = {"remaining": None, "reset": 0.0, "blocked_until": 0.0}
+_rate_limit_lock = threading.Lock()
+# Set on Ctrl-C so in-flight workers stop waiting and retrying.
+_requests_cancelled = threading.Event()
 
+
+def _wait_for_rate_limit():
+    """Sleeps while the shared budget is blocked or nearly spent."""
+    with _rate_limit_lock:
+        until = _rate_limit["blocked_until"]
+        remaining = _rate_limit["remaining"]
+        if remaining is not None and remaining < RATE_LIMIT_THRESHOLD:
+            until = max(until, _rate_limit["reset"])
+
+    delay = until - time.time()
+    # A reset that is far away is not worth stalling the whole run for.
+    if 0 < delay <= RATE_LIMIT_MAX_WAIT:
+        _requests_cancelled.wait(delay)
+
+
+def _is_rate_limited(resp):
+    if resp.status_code == 429:
+        return True
+    return resp.status_code == 403 and "rate limit" in resp.text.lower()
+
+
+def gh_get(session, url, **kwargs):
+    """
+    GETs a GitHub REST URL, honouring X-RateLimit-* and Retry-After.
+    Rate-limited responses are retried with jittered exponential backoff;
+    the last response is returned if the limit does not clear in time.
+    """
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        _wait_for_rate_limit()
+        if _requests_cancelled.is_set():
+            raise requests.RequestException("run interrupted")
+        resp = session.get(url, timeout=REQUEST_TIMEOUT, **kwargs)
+        if resp.status_code == 401:
+            handle_rejected_token()
+            return resp
+
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        reset = resp.headers.get("X-RateLimit-Reset")
+        with _rate_limit_lock:
+            if remaining is not None:
+                _rate_limit["remaining"] = int(remaining)
+            if reset is not None:
+                _rate_limit["reset"] = float(reset)
+
+        if not _is_rate_limited(resp) or attempt == RATE_LIMIT_RETRIES:
+            return resp
+
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            delay = float(retry_after)
+        elif remaining == "0" and reset is not None:
+            delay = float(reset) - time.time()
+        else:
+            delay = 2**attempt + random.uniform(0, 1)
+        if delay > RATE_LIMIT_MAX_WAIT:
+            return resp
+
+        with _rate_limit_lock:
+            _rate_limit["blocked_until"] = max(
+                _rate_limit["blocked_until"], time.time() + delay
+            )
+
+
+@functools.lru_cache(maxsize=1)
 def get_token_from_gh_cli():
-    """Attempts to retrieve the GitHub token from the 'gh' CLI tool."""
+    """
+    Attempts to retrieve the GitHub token from the 'gh' CLI tool.
+    The token is kept in $XDG_RUNTIME_DIR for TOKEN_CACHE_TTL seconds so
+    most runs skip spawning gh.
+    """
+    if TOKEN_CACHE_PATH:
+        try:
+            if time.time() - os.stat(TOKEN_CACHE_PATH).st_mtime < TOKEN_CACHE_TTL:
+                with open(TOKEN_CACHE_PATH, "r") as f:
+                    token = f.read().strip()
+                if token:
+                    return token
+        except OSError:
+            pass
+
     try:
         result = subprocess.run(
             ["gh", "auth", "token"], capture_output=True, text=True, check=True
         )
-        return result.stdout.strip()
     except (FileNotFoundError, subprocess.CalledProcessError):
         return None
+    token = result.stdout.strip()
+
+    if TOKEN_CACHE_PATH and token:
+        try:
+            fd = os.open(
+                TOKEN_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+            )
+            with os.fdopen(fd, "w") as f:
+                # O_CREAT's mode is ignored if the file already existed.
+                os.fchmod(f.fileno(), 0o600)
+                f.write(token)
+        except OSError:
+            pass
+    return token
+
+
+def forget_cached_token():
+    """Drops the cached gh token, e.g. after `gh auth logout` or a rotation."""
+    get_token_from_gh_cli.cache_clear()
+    if TOKEN_CACHE_PATH:
+        try:
+            os.remove(TOKEN_CACHE_PATH)
+        except OSError:
+            pass
+
 
+# Where the token in use came from ("env" or "gh"), set by resolve_token().
+_token_source = None
+_token_rejected = False
+_token_rejected_lock = threading.Lock()
 
-def get_upstream_info(owner, repo, branch_hint=None, token=None):
-    """Fetches commit timestamp from GitHub."""
-    headers = {}
+
+def resolve_token():
+    """Returns the GitHub token from $GITHUB_TOKEN or, failing that, gh."""
+    global _token_source
+    token = os.environ.get("GITHUB_TOKEN")
     if token:
-        headers["Authorization"] = f"token {token}"
+        _token_source = "env"
+        return token
 
-    branch = branch_hint
-    if not branch:
-        try:
-            resp = requests.get(
-                f"https://api.github.com/repos/{owner}/{repo}", headers=headers
-            )
-            resp.raise_for_status()
-            branch = resp.json().get("default_branch")
-        except requests.RequestException:
-            return None, None
+    token = get_token_from_gh_cli()
+    _token_source = "gh" if token else None
+    return token
+
+
+def handle_rejected_token():
+    """Reacts once per run to GitHub answering 401 for our token."""
+    global _token_rejected
+    with _token_rejected_lock:
+        if _token_rejected:
+            return
+        _token_rejected = True
+
+    if _token_source == "gh":
+        forget_cached_token()
+        print(
+            "⚠️  GitHub rejected the gh token (401); removed the cached copy "
+            "so the next run asks gh again.",
+            file=sys.stderr,
+        )
+    elif _token_source == "env":
+        print(
+            "⚠️  GitHub rejected GITHUB_TOKEN (401); update or unset it.",
+            file=sys.stderr,
+        )
+
+
+def parse_github_date(date_str):
+    """Converts a GitHub ISO-8601 timestamp to epoch seconds."""
+    # fromisoformat accepts the trailing "Z" (3.11+) and skips strptime's regex.
+    return int(datetime.fromisoformat(date_str).timestamp())
+
+
+def format_timestamp(ts):
+    """Renders epoch seconds as a local-time datetime for display."""
+    return datetime.fromtimestamp(ts).astimezone()
+
+
+def make_session(token=None):
+    """Creates a GitHub API session that keeps its TLS connection alive."""
+    session = requests.Session()
+    # Set once here so individual calls only pass their conditional headers.
+    session.headers.update(
+        {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+    )
+    if token:
+        session.headers["Authorization"] = f"token {token}"
+
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=16,
+        max_retries=Retry(
+            # 429s are left to gh_get, which knows GitHub's rate-limit headers.
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+        ),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+def _fetch_upstream_info(owner, repo, branch_hint, session, downstream_ts):
+    """
+    Fetches commit timestamp from GitHub.
+    The commit list endpoint is used because its entries omit the files and
+    stats that /commits/{ref} returns; without a sha it lists the default
+    branch, so one request suffices either way.
+    Sends the cached ETag, or else If-Modified-Since for the locked commit,
+    so unchanged branches cost a free 304.
+    An If-Modified-Since 304 is reported as downstream_ts, so an input that
+    is ahead of upstream may show as up to date rather than "Local ahead".
+    Pass downstream_ts=None to get the real upstream timestamp instead.
+    Returns (timestamp, shareable); a result is not shareable
+    when it only tells us nothing is newer than downstream_ts.
+    """
+    cache_key = f"{owner}/{repo}#{branch_hint or ''}"
+    cached = get_cached_etag(cache_key)
+
+    if cached:
+        headers = {"If-None-Match": cached["etag"]}
+    elif downstream_ts is not None:
+        headers = {
+            "If-Modified-Since": email.utils.formatdate(downstream_ts, usegmt=True)
+        }
+    else:
+        headers = None
 
     try:
-        api_url = f"https://api.github.com/repos/{owner}/{repo}/branches/{branch}"
-        resp = requests.get(api_url, headers=headers)
-        resp.raise_for_status()
+        api_url = f"https://api.github.com/repos/{owner}/{repo}/commits"
+        params = {"per_page": 1}
+        if branch_hint:
+            params["sha"] = branch_hint
+        resp = gh_get(session, api_url, headers=headers, params=params)
+        if resp.status_code == 304:
+            # Without an ETag, 304 only means nothing newer than the lock
+            # file, so an input ahead of upstream may collapse into up to date.
+            return (cached["ts"] if cached else downstream_ts), bool(cached)
+        # 404s, bad refs and rate limits gh_get could not wait out all land
+        # here; checking the status avoids raising and unwinding an HTTPError.
+        if resp.status_code != 200:
+            return None, True
         data = resp.json()
+        if not data:
+            return None, True
 
-        date_str = data["commit"]["commit"]["committer"]["date"]
-        dt_utc = datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ").replace(
-            tzinfo=timezone.utc
-        )
-        return int(dt_utc.timestamp()), dt_utc.astimezone()
+        upstream = parse_github_date(data[0]["commit"]["committer"]["date"])
     except requests.RequestException:
-        return None, None
+        return None, True
+
+    etag = resp.headers.get("ETag")
+    if etag:
+        set_cached_etag(cache_key, {"etag": etag, "ts": upstream})
+    return upstream, True
+
+
+_upstream_cache = {}
+_upstream_key_locks = {}
+_upstream_cache_lock = threading.Lock()
+
+
+def get_upstream_info(owner, repo, branch_hint, session, downstream_ts=None):
+    """
+    Fetches commit timestamp from GitHub, once per owner/repo/ref per run.
+    Concurrent callers for the same key wait for a single request.
+    """
+    key = (owner, repo, branch_hint or "")
+    with _upstream_cache_lock:
+        key_lock = _upstream_key_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        if key in _upstream_cache:
+            return _upstream_cache[key]
+
+        upstream, shareable = _fetch_upstream_info(
+            owner, repo, branch_hint, session, downstream_ts
+        )
+        if shareable:
+            _upstream_cache[key] = upstream
+        return upstream
 
 
-def check_input(name, node_data, token=None, only_outdated=False):
+def get_upstream_batch(targets, session):
     """
-    Checks a single flake input.
-    If only_outdated is True, it prints nothing unless an update is found.
+    Fetches commit timestamps for many repos with a single GraphQL query.
+    Returns a dict keyed by (owner, repo, branch_hint); repos that could not
+    be resolved are left out so callers can fall back to the REST API.
     """
+    keys = list(dict.fromkeys(targets))
+    if not keys:
+        return {}
+
+    fields = []
+    for i, (owner, repo, branch_hint) in enumerate(keys):
+        if branch_hint:
+            ref = f"ref(qualifiedName: {json.dumps(branch_hint)})"
+        else:
+            ref = "ref: defaultBranchRef"
+        fields.append(
+            f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) "
+            f"{{ {ref} {{ target {{ ... on Commit {{ committedDate }} }} }} }}"
+        )
+    query = "query { " + " ".join(fields) + " }"
+
     try:
-        if node_data["locked"]["type"] != "github":
-            return
+        resp = session.post(
+            GRAPHQL_URL, json={"query": query}, timeout=REQUEST_TIMEOUT
+        )
+        if resp.status_code == 401:
+            handle_rejected_token()
+        if resp.status_code != 200:
+            return {}
+        # Partial results come back alongside "errors" for missing repos.
+        data = resp.json().get("data") or {}
+    except (requests.RequestException, ValueError):
+        return {}
+
+    results = {}
+    for i, key in enumerate(keys):
+        ref = (data.get(f"r{i}") or {}).get("ref") or {}
+        date_str = (ref.get("target") or {}).get("committedDate")
+        if date_str:
+            results[key] = parse_github_date(date_str)
+    return results
+
+
+def load_lock_data():
+    """
+    Parses the whole flake.lock.
+    The result is pickled and reused until the file's mtime or size changes.
+    """
+    st = os.stat(FLAKE_LOCK_PATH)
+    key = (os.path.abspath(FLAKE_LOCK_PATH), st.st_mtime_ns, st.st_size)
+
+    try:
+        with open(LOCK_CACHE_PATH, "rb") as f:
+            cached_key, lock_data = pickle.load(f)
+        if cached_key == key:
+            return lock_data
+    except (OSError, pickle.UnpicklingError, EOFError, TypeError, ValueError):
+        pass
+
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError.
+        with open(FLAKE_LOCK_PATH, "rb") as f:
+            lock_data = orjson.loads(f.read())
+    else:
+        with open(FLAKE_LOCK_PATH, "r") as f:
+            lock_data = json.load(f)
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{LOCK_CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((key, lock_data), f, protocol=5)
+        os.replace(tmp_path, LOCK_CACHE_PATH)
+    except OSError:
+        pass
+    return lock_data
+
+
+def load_lock_node(name):
+    """
+    Returns a single node from flake.lock, or None if it does not exist.
+    With ijson installed, parsing stops once that node has been read.
+    """
+    if ijson is None or "." in name:
+        return load_lock_data()["nodes"].get(name)
+
+    with open(FLAKE_LOCK_PATH, "rb") as f:
+        return next(ijson.items(f, f"nodes.{name}"), None)
+
 
-        downstream_ts = node_data["locked"]["lastModified"]
-        downstream_dt = datetime.fromtimestamp(downstream_ts).astimezone()
-        owner = node_data["locked"]["owner"]
-        repo = node_data["locked"]["repo"]
-        branch_hint = node_data.get("original", {}).get("ref")
+def parse_github_node(node_data):
+    """Returns (lastModified, owner, repo, branch_hint) for GitHub inputs."""
+    # Root and non-GitHub nodes are the common case; reject them without raising.
+    locked = node_data.get("locked")
+    if not locked or locked.get("type") != "github":
+        return None
+
+    try:
+        downstream_ts = locked["lastModified"]
+        owner = locked["owner"]
+        repo = locked["repo"]
     except KeyError:
-        return
+        return None
+
+    original = node_data.get("original")
+    branch_hint = original.get("ref") if original else None
+    return downstream_ts, owner, repo, branch_hint
+
+
+def check_input(
+    name, parsed, session, only_outdated=False, prefetched=None, shared_keys=()
+):
+    """
+    Checks a single flake input and returns the report as a string.
+    parsed is the input's parse_github_node() result.
+    If only_outdated is True, it returns nothing unless an update is found.
+    Upstream info found in prefetched (see get_upstream_batch) is used as is.
+    Repos in shared_keys are pinned by several inputs and skip
+    If-Modified-Since, so each of them sees the same upstream timestamp.
+    """
+    if parsed is None:
+        return None
+
+    downstream_ts, owner, repo, branch_hint = parsed
 
     # Fetch Upstream
-    upstream_ts, upstream_dt = get_upstream_info(owner, repo, branch_hint, token)
+    key = (owner, repo, branch_hint)
+    if prefetched and key in prefetched:
+        upstream_ts = prefetched[key]
+    else:
+        since_ts = None if key in shared_keys else downstream_ts
+        upstream_ts = get_upstream_info(owner, repo, branch_hint, session, since_ts)
 
     if upstream_ts is None:
-        if not only_outdated:
-            print(f"Checking {name} ({owner}/{repo})...")
-            print("    ❌ Could not fetch upstream info.")
-        return
+        if only_outdated:
+            return None
+        return (
+            f"Checking {name} ({owner}/{repo})...\n"
+            "    ❌ Could not fetch upstream info.\n"
+        )
 
-    # Logic: Should we print?
+    # Logic: Should we report?
     is_outdated = downstream_ts < upstream_ts
 
     # If we only want outdated ones, and this is NOT outdated, return silently.
     if only_outdated and not is_outdated:
-        return
+        return None
 
-    print(f"Checking {name} ({owner}/{repo})...")
+    buf = io.StringIO()
+    buf.write(f"Checking {name} ({owner}/{repo})...\n")
 
     if is_outdated:
         diff = timedelta(seconds=upstream_ts - downstream_ts)
-        print("    🚨 UPDATE AVAILABLE")
-        print(f"       Local:    {downstream_dt}")
-        print(f"       Upstream: {upstream_dt}")
-        print(f"       Lag:      {diff}")
+        buf.write("    🚨 UPDATE AVAILABLE\n")
+        buf.write(f"       Local:    {format_timestamp(downstream_ts)}\n")
+        buf.write(f"       Upstream: {format_timestamp(upstream_ts)}\n")
+        buf.write(f"       Lag:      {diff}\n")
     elif downstream_ts > upstream_ts:
         diff = timedelta(seconds=downstream_ts - upstream_ts)
-        print(f"    ⚠️  Local ahead by {diff}")
+        buf.write(f"    ⚠️  Local ahead by {diff}\n")
     else:
-        print("    ✅ Up to date")
+        buf.write("    ✅ Up to date\n")
 
-    print("-" * 40)
+    buf.write("-" * 40 + "\n")
+    return buf.getvalue()
 
 
 def main():
@@ -133,16 +577,18 @@ def main():
     check_all = args.all or args.all_outdated
     only_outdated = args.all_outdated
 
-    # Load Lock File
+    # Load Lock File (--all needs the root inputs, so it parses everything)
     try:
-        with open(FLAKE_LOCK_PATH, "r") as f:
-            lock_data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
+        if check_all:
+            lock_data = load_lock_data()
+        else:
+            node_data = load_lock_node(args.flake_input)
+    except LOCK_ERRORS as e:
         print(f"Error reading lock file: {e}")
         sys.exit(1)
 
     # Auth Token
-    token = os.environ.get("GITHUB_TOKEN") or get_token_from_gh_cli()
+    token = resolve_token()
     if not token and check_all:
         # Print tip only if we are showing everything.
         # In 'only_outdated' mode, we generally want less noise unless necessary.
@@ -151,6 +597,8 @@ def main():
                 "ℹ️  Tip: Set GITHUB_TOKEN or use 'gh auth login' to avoid rate limits.\n"
             )
 
+    session = make_session(token)
+
     # Execution Loop
     if check_all:
         root_node_name = lock_data.get("root", "root")
@@ -166,24 +614,83 @@ def main():
         if not target_nodes and not only_outdated:
             print("No inputs found to check.")
 
+        jobs = []
         for name, node_key in target_nodes:
             # Handle case where keys map to node names
             actual_node_name = node_key if isinstance(node_key, str) else name
             if actual_node_name in lock_data["nodes"]:
-                check_input(
-                    name, lock_data["nodes"][actual_node_name], token, only_outdated
+                # Parsed once here; non-GitHub nodes never produce a report.
+                parsed = parse_github_node(lock_data["nodes"][actual_node_name])
+                if parsed is not None:
+                    jobs.append((name, parsed))
+
+        # GraphQL needs auth, but then answers every input in one request.
+        prefetched = {}
+        if token:
+            targets = [parsed[1:] for _, parsed in jobs]
+            prefetched = get_upstream_batch(targets, session)
+
+        # Reports are collected and written once, so threads never interleave.
+        # Each input keeps its slot, so output follows the lock file's order.
+        reports = []
+
+        # Only inputs still needing a REST round trip are worth a thread.
+        remote_jobs = []
+        remote_keys = Counter()
+        for name, parsed in jobs:
+            if parsed[1:] not in prefetched:
+                remote_jobs.append((len(reports), name, parsed))
+                remote_keys[parsed[1:]] += 1
+                reports.append(None)
+            else:
+                reports.append(
+                    check_input(name, parsed, session, only_outdated, prefetched)
                 )
+
+        if remote_jobs:
+            # Network-bound, so threads overlap the remaining REST calls.
+            workers = min(MAX_WORKERS, len(remote_jobs))
+            shared_keys = {key for key, count in remote_keys.items() if count > 1}
+            executor = ThreadPoolExecutor(max_workers=workers)
+            try:
+                futures = [
+                    (
+                        slot,
+                        executor.submit(
+                            check_input,
+                            name,
+                            parsed,
+                            session,
+                            only_outdated,
+                            shared_keys=shared_keys,
+                        ),
+                    )
+                    for slot, name, parsed in remote_jobs
+                ]
+
+                for slot, future in futures:
+                    reports[slot] = future.result()
+            except KeyboardInterrupt:
+                # Drop queued inputs; a plain shutdown() would still run them all.
+                _requests_cancelled.set()
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            executor.shutdown()
+
+        sys.stdout.write("".join(report for report in reports if report))
     else:
         # Check single specific input (Never hide output here)
-        if args.flake_input not in lock_data["nodes"]:
+        if node_data is None:
             print(f"Error: Input '{args.flake_input}' not found.")
             sys.exit(1)
-        check_input(
+        out = check_input(
             args.flake_input,
-            lock_data["nodes"][args.flake_input],
-            token,
+            parse_github_node(node_data),
+            session,
             only_outdated=False,
         )
+        if out:
+            sys.stdout.write(out)
 
 
 if __name__ == "__main__":